@@ -6,20 +6,59 @@ This mirrors the functionality of the JS scraper in scraper.js
 """
 
 import sys
-import json
+import os
+import asyncio
 import logging
 import re
-from urllib.parse import urljoin, urlparse
+from hashlib import blake2b
+from contextlib import AsyncExitStack
+from itertools import islice
+from urllib.parse import urlparse
+
+import orjson
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 try:
-    from scrapling import DynamicFetcher
+    from scrapling.fetchers import AsyncDynamicSession, AsyncFetcher
 except ImportError as e:
     logger.error(f"CRITICAL: Failed to import scrapling: {e}")
-    DynamicFetcher = None
+    AsyncDynamicSession = None
+    AsyncFetcher = None
+
+# Max pages fetched in parallel per crawl
+CONCURRENCY = int(os.getenv("ARCHITONIC_CONCURRENCY", "10"))
+
+# Precompiled patterns
+_SKIP_CRUMBS = frozenset({'home', 'brands', 'products', 'collections'})
+_TRAILING_ID_RE = re.compile(r'-(\d+)$')
+# Longest alternatives first so "Collections by" wins over "Collections"
+_BRAND_STRIP_RE = re.compile(r'\s*(?:Collections by|Products by|Collections|Products)\s*')
+_COLL_RE = re.compile(r'/(?:collection|collections|category|product-group)/')
+_COLL_TAIL_RE = re.compile(r'/(?:collections|products)$')
+_PROD_RE = re.compile(r'/(?:p|product)/')
+_SKIP_SCHEMES = ('mailto:', 'javascript:', 'tel:')
+# Playwright errors meaning the browser itself is gone, not just one page failing
+_BROWSER_GONE_RE = re.compile(
+    r'(?:target|browser|context)[^.]{0,40}\bclosed|disconnected|connection closed', re.IGNORECASE
+)
+
+# Selectors used on every product page. Scrapling memoizes the CSS->XPath
+# translation per selector string, so keeping these as shared constants
+# means each one is translated once per process.
+_H1_TEXT = 'h1::text'
+_IMG_SRC = 'img::attr(src)'
+_LINK_HREFS = 'a::attr(href)'
+_CAROUSEL_IMG_SELECTORS = ('img.opacity-100::attr(src)', 'img.active::attr(src)')
+_MAIN_IMG_SELECTORS = (
+    '.product-gallery__main-image img::attr(src)',
+    'img[itemprop="image"]::attr(src)',
+    '.product-image img::attr(src)',
+    'main img[src*="/product/"]::attr(src)'
+)
+_META_DESCRIPTION = 'meta[name="description"]::attr(content)'
+_ATTRIBUTE_TEXT = 'div[class*="Attribute"]::text'
+_DESCRIPTION_SELECTORS = ('.product-description::text', '#description::text', '.details-content::text')
 
 
 def extract_brand_name(page, url):
@@ -28,16 +67,16 @@ def extract_brand_name(page, url):
     
     try:
         # Try H1 first
-        h1 = page.css('h1::text').get()
+        h1 = page.css(_H1_TEXT).get()
         if h1:
-            brand_name = h1.replace('Collections by', '').replace('Products by', '').replace('Collections', '').replace('Products', '').strip()
+            brand_name = _BRAND_STRIP_RE.sub(' ', h1).strip()
         
         # Fallback to breadcrumbs
         if not brand_name or len(brand_name) < 2:
             breadcrumbs = page.css('.breadcrumb-item::text, [class*="breadcrumb"] li::text, .breadcrumbs a::text').getall()
             for crumb in reversed(breadcrumbs):
                 crumb = crumb.strip()
-                if crumb and not re.match(r'(home|brands|products|collections)', crumb, re.I):
+                if crumb and crumb.lower() not in _SKIP_CRUMBS:
                     brand_name = crumb
                     break
         
@@ -74,96 +113,124 @@ def extract_brand_logo(page):
 
 
 def discover_collection_links(page, base_url):
-    """Find collection and product links on Architonic page."""
+    """Find collection and product links on Architonic page. Returns (collections, products) sets."""
     collections = set()
     products = set()
     
     try:
-        all_links = page.css('a::attr(href)').getall()
+        all_links = page.css(_LINK_HREFS).getall()
         
         for href in all_links:
-            if not href or 'architonic.com' not in href:
+            # Cheapest rejections first: anchors, query-only and non-http schemes
+            if not href or href[0] in '#?' or href.startswith(_SKIP_SCHEMES):
+                continue
+            if 'architonic.com' not in href:
                 continue
             
             # Collection links
-            if any(x in href for x in ['/collection/', '/collections/', '/category/', '/product-group/']):
-                if not href.endswith('/collections') and not href.endswith('/products'):
-                    collections.add(href)
+            if _COLL_RE.search(href) and not _COLL_TAIL_RE.search(href):
+                collections.add(href)
             
             # Direct product links
-            if '/p/' in href or '/product/' in href:
+            if _PROD_RE.search(href):
                 products.add(href)
         
     except Exception as e:
         logger.warning(f"Link discovery error: {e}")
     
-    return list(collections), list(products)
+    return collections, products
+
+
+def extract_collection_products(page, limit=50):
+    """Collect unique product links from a collection page, up to limit."""
+    prod_urls = []
+    seen_local = set()
+    for href in page.css(_LINK_HREFS).getall():
+        if not href or href in seen_local:
+            continue
+        if _PROD_RE.search(href) and 'architonic.com' in href:
+            seen_local.add(href)
+            prod_urls.append(href)
+            if len(prod_urls) >= limit:
+                break
+    return prod_urls
+
+
+async def fetch_static(url):
+    """
+    Fetch a page's server-rendered HTML over plain HTTP, without a browser.
+    Returns None when the request fails so callers can fall back to rendering.
+    """
+    try:
+        page = await AsyncFetcher.get(url, timeout=15)
+    except Exception as e:
+        logger.warning(f"Static fetch failed for {url}: {e}")
+        return None
+    return page if page.status == 200 else None
+
+
+def scan_product_images(all_imgs):
+    """
+    Single pass over a page's image sources.
+    Returns the first /product/ image (stopping there) and the first non-logo
+    Architonic image seen before it, used as the last-resort fallback.
+    """
+    fallback = ""
+    for img in (src for src in all_imgs if src and 'architonic.com' in src):
+        if '/product/' in img:
+            return img, fallback
+        if not fallback and 'logo' not in img.lower():
+            fallback = img
+    return "", fallback
 
 
 def extract_product_from_page(page, url, brand_name, collection_name="Products"):
     """Extract product data from a product detail page."""
     try:
         # Get product name
-        name = page.css('h1::text').get() or ''
+        name = page.css(_H1_TEXT).get() or ''
         name = name.strip()
         if not name:
             return None
         
-        # Get product image - multiple strategies
+        # Get product image, by priority: active carousel image, /product/
+        # image, main gallery image, then any other Architonic image
         image_url = ""
         
-        # Strategy 1: Active carousel image
-        for sel in ['img.opacity-100::attr(src)', 'img.active::attr(src)']:
+        for sel in _CAROUSEL_IMG_SELECTORS:
             img = page.css(sel).get()
             if img and 'architonic.com' in img and '/family/' not in img:
                 image_url = img
                 break
         
-        # Strategy 2: Product image
-        if not image_url:
-            all_imgs = page.css('img::attr(src)').getall()
-            for img in all_imgs:
-                if img and '/product/' in img and 'architonic.com' in img:
-                    image_url = img
-                    break
-        
-        # Strategy 3: Main image
         if not image_url:
-            main_selectors = [
-                '.product-gallery__main-image img::attr(src)',
-                'img[itemprop="image"]::attr(src)',
-                '.product-image img::attr(src)',
-                'main img[src*="/product/"]::attr(src)'
-            ]
-            for sel in main_selectors:
-                img = page.css(sel).get()
-                if img and img.startswith('http') and '/family/' not in img:
-                    image_url = img
-                    break
-        
-        # Strategy 4: Any large image
-        if not image_url:
-            for img in all_imgs:
-                if img and 'architonic.com' in img and 'logo' not in img.lower():
-                    image_url = img
-                    break
+            image_url, fallback = scan_product_images(page.css(_IMG_SRC).getall())
+            
+            # Main gallery selectors are only worth querying without a /product/ hit
+            if not image_url:
+                for sel in _MAIN_IMG_SELECTORS:
+                    img = page.css(sel).get()
+                    if img and img.startswith('http') and '/family/' not in img:
+                        image_url = img
+                        break
+            
+            image_url = image_url or fallback
         
         if not image_url:
             return None
         
         # Get description
-        description = page.css('meta[name="description"]::attr(content)').get() or ''
+        description = page.css(_META_DESCRIPTION).get() or ''
         
         # Try attribute elements
         if not description or len(description) < 50:
-            attrs = page.css('div[class*="Attribute"]::text').getall()
+            attrs = page.css(_ATTRIBUTE_TEXT).getall()
             if attrs:
-                description = ' | '.join([a.strip() for a in attrs if a.strip()])
+                description = ' | '.join([text for a in attrs if (text := a.strip())])
         
         # Try content selectors
         if not description or len(description) < 50:
-            content_selectors = ['.product-description::text', '#description::text', '.details-content::text']
-            for sel in content_selectors:
+            for sel in _DESCRIPTION_SELECTORS:
                 desc = page.css(sel).get()
                 if desc and len(desc) > 30:
                     description = desc.strip()
@@ -174,14 +241,10 @@ def extract_product_from_page(page, url, brand_name, collection_name="Products")
         
         # Extract variant ID from URL
         model = name
-        try:
-            url_parts = url.rstrip('/').split('/')
-            last_part = url_parts[-1]
-            id_match = re.search(r'-(\d+)$', last_part)
-            if id_match:
-                model = f"{name} #{id_match.group(1)}"
-        except:
-            pass
+        last_part = url.rstrip('/').rsplit('/', 1)[-1]
+        id_match = _TRAILING_ID_RE.search(last_part)
+        if id_match:
+            model = f"{name} #{id_match.group(1)}"
         
         return {
             "mainCategory": "Furniture",
@@ -199,101 +262,155 @@ def extract_product_from_page(page, url, brand_name, collection_name="Products")
         return None
 
 
-def scrape_architonic(url):
+# One browser per process, started by the first scrape and reused by later ones.
+# _page_slots bounds open pages across all concurrent scrapes to the session's
+# max_pages, so fetches wait here instead of timing out inside scrapling's page pool.
+_browser_stack = AsyncExitStack()
+_session = None
+_session_lock = asyncio.Lock()
+_page_slots = asyncio.Semaphore(CONCURRENCY)
+
+
+async def get_session():
+    """Return the shared browser session, starting it on first use."""
+    global _session
+    async with _session_lock:
+        if _session is None:
+            _session = await _browser_stack.enter_async_context(
+                AsyncDynamicSession(headless=True, max_pages=CONCURRENCY)
+            )
+        return _session
+
+
+async def close_session(session=None):
+    """Shut the shared browser down; the next scrape starts a fresh one.
+    With a session, only close it if it is still the current one, so scrapes
+    that saw the same crash don't also tear down its replacement."""
+    global _session
+    async with _session_lock:
+        if session is not None and session is not _session:
+            return
+        _session = None
+        await _browser_stack.aclose()
+
+
+def browser_is_dead(session, error):
+    """True when a failure came from the shared browser going away (crash,
+    disconnect) rather than from one bad page, e.g. a render timeout."""
+    browser = getattr(getattr(session, 'context', None), 'browser', None)
+    if browser is not None and not browser.is_connected():
+        return True
+    return _BROWSER_GONE_RE.search(str(error)) is not None
+
+
+async def scrape_architonic(url):
     """
     Main Architonic scraping function.
     Crawls brand pages on Architonic to extract product data.
     """
     logger.info(f"Starting Architonic scrape for: {url}")
     
-    if DynamicFetcher is None:
-        raise RuntimeError("Scrapling DynamicFetcher is not available")
+    if AsyncDynamicSession is None:
+        raise RuntimeError("Scrapling AsyncDynamicSession is not available")
     
-    fetcher = DynamicFetcher(headless=True)
-    products = []
+    # Deduplicated as they arrive, keyed by an 8-byte digest of model + image
+    products = {}
     seen_urls = set()
+    # Product and collection pages that errored, so callers can tell a partial crawl
+    failed_pages = 0
+    
+    def add_product(product):
+        key = blake2b(f"{product['model']}|{product['imageUrl']}".lower().encode(), digest_size=8).digest()
+        products.setdefault(key, product)
     
+    fetcher = None
     try:
-        # Load main page
-        logger.info("Loading brand page...")
-        page = fetcher.fetch(url, wait_time=3)
+        # Shared browser; every fetch just opens a new page in it
+        fetcher = await get_session()
+        
+        async def scrape_product(prod_url, collection_name):
+            async with _page_slots:
+                prod_page = await fetcher.fetch(prod_url, wait=2000)
+            return extract_product_from_page(prod_page, prod_url, brand_name, collection_name)
+        
+        async def scrape_collection(coll_url):
+            # Listings are server-rendered; only render when plain HTML has no products
+            async with _page_slots:
+                coll_page = await fetch_static(coll_url)
+                prod_urls = extract_collection_products(coll_page) if coll_page else []
+                if not prod_urls:
+                    coll_page = await fetcher.fetch(coll_url, wait=3000)
+                    prod_urls = extract_collection_products(coll_page)
+            
+            # Get collection name
+            coll_name = coll_page.css(_H1_TEXT).get() or "Collection"
+            coll_name = coll_name.strip()
+            return coll_name, prod_urls
+        
+        parsed = urlparse(url)
+        base_url = f"{parsed.scheme}://{parsed.netloc}"
         
-        base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+        # Load main page, rendering it only if the plain HTML has no links to follow
+        logger.info("Loading brand page...")
+        page = await fetch_static(url)
+        collections, direct_products = discover_collection_links(page, base_url) if page else (set(), set())
+        if not collections and not direct_products:
+            async with _page_slots:
+                page = await fetcher.fetch(url, wait=3000)
+            collections, direct_products = discover_collection_links(page, base_url)
         
         # Extract brand info
         brand_name = extract_brand_name(page, url)
         brand_logo = extract_brand_logo(page)
         logger.info(f"Brand identified: {brand_name}")
-        
-        # Discover links
-        logger.info("Discovering collections and products...")
-        collections, direct_products = discover_collection_links(page, base_url)
         logger.info(f"Found {len(collections)} collections and {len(direct_products)} direct products")
         
         # Process direct products from main page first
-        for prod_url in direct_products[:50]:  # Limit
-            if prod_url in seen_urls:
-                continue
-            seen_urls.add(prod_url)
-            
-            try:
-                prod_page = fetcher.fetch(prod_url, wait_time=2)
-                product = extract_product_from_page(prod_page, prod_url, brand_name, "Featured")
-                if product:
-                    products.append(product)
-                    logger.info(f"  Extracted: {product['model']}")
-            except Exception as e:
-                logger.warning(f"  Failed to scrape product {prod_url}: {e}")
+        prod_urls = [u for u in islice(direct_products, 50) if u not in seen_urls]  # Limit
+        seen_urls.update(prod_urls)
+        results = await asyncio.gather(
+            *[scrape_product(u, "Featured") for u in prod_urls], return_exceptions=True
+        )
+        for prod_url, product in zip(prod_urls, results):
+            if isinstance(product, Exception):
+                logger.warning(f"  Failed to scrape product {prod_url}: {product}")
+                failed_pages += 1
+            elif product:
+                add_product(product)
+                logger.info(f"  Extracted: {product['model']}")
         
         # Process collections
-        for coll_url in collections[:20]:  # Limit to 20 collections
-            if coll_url in seen_urls:
+        coll_urls = [u for u in islice(collections, 20) if u not in seen_urls]  # Limit to 20 collections
+        seen_urls.update(coll_urls)
+        logger.info(f"Processing {len(coll_urls)} collections...")
+        listings = await asyncio.gather(
+            *[scrape_collection(u) for u in coll_urls], return_exceptions=True
+        )
+        
+        jobs = []
+        for coll_url, listing in zip(coll_urls, listings):
+            if isinstance(listing, Exception):
+                logger.warning(f"Failed to process collection {coll_url}: {listing}")
+                failed_pages += 1
                 continue
-            seen_urls.add(coll_url)
             
-            try:
-                logger.info(f"Processing collection: {coll_url}")
-                coll_page = fetcher.fetch(coll_url, wait_time=3)
-                
-                # Get collection name
-                coll_name = coll_page.css('h1::text').get() or "Collection"
-                coll_name = coll_name.strip()
-                
-                # Find product links in collection
-                coll_products = coll_page.css('a::attr(href)').getall()
-                prod_urls = [
-                    href for href in coll_products 
-                    if href and ('/p/' in href or '/product/' in href) and 'architonic.com' in href
-                ]
-                prod_urls = list(set(prod_urls))[:50]  # Limit per collection
-                
-                logger.info(f"  Found {len(prod_urls)} products in {coll_name}")
-                
-                for prod_url in prod_urls:
-                    if prod_url in seen_urls:
-                        continue
-                    seen_urls.add(prod_url)
-                    
-                    try:
-                        prod_page = fetcher.fetch(prod_url, wait_time=2)
-                        product = extract_product_from_page(prod_page, prod_url, brand_name, coll_name)
-                        if product:
-                            products.append(product)
-                    except Exception as e:
-                        continue
-                        
-            except Exception as e:
-                logger.warning(f"Failed to process collection {coll_url}: {e}")
-        
-        # Deduplicate
-        seen = set()
-        unique_products = []
-        for p in products:
-            key = f"{p['model']}|{p['imageUrl']}".lower()
-            if key not in seen:
-                seen.add(key)
-                unique_products.append(p)
+            coll_name, prod_urls = listing
+            logger.info(f"  Found {len(prod_urls)} products in {coll_name}")
+            
+            for prod_url in prod_urls:
+                if prod_url in seen_urls:
+                    continue
+                seen_urls.add(prod_url)
+                jobs.append(scrape_product(prod_url, coll_name))
         
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        for product in results:
+            if isinstance(product, Exception):
+                failed_pages += 1
+            elif product:
+                add_product(product)
+    
+        unique_products = list(products.values())
         logger.info(f"Architonic scrape complete: {len(unique_products)} unique products")
         
         return {
@@ -301,26 +418,45 @@ def scrape_architonic(url):
             "brandInfo": {
                 "name": brand_name,
                 "logo": brand_logo
-            }
+            },
+            "failedPages": failed_pages
         }
         
     except Exception as e:
         logger.error(f"Architonic scrape failed: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        # Other scrapes share this browser: only replace it once it has actually died
+        if fetcher is not None and browser_is_dead(fetcher, e):
+            await close_session(fetcher)
         raise e
 
 
 # CLI support
 if __name__ == "__main__":
+    # main.py configures logging for the service; only the CLI needs its own
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
     if len(sys.argv) < 2:
         print("Usage: python architonic_scraper.py <architonic_url>")
         sys.exit(1)
     
     url = sys.argv[1]
     try:
-        result = scrape_architonic(url)
-        print(json.dumps(result))
+        async def run_once():
+            try:
+                return await scrape_architonic(url)
+            finally:
+                await close_session()
+        
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            loop_factory = None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            result = runner.run(run_once())
+        sys.stdout.buffer.write(orjson.dumps(result) + b"\n")
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
+        sys.stdout.buffer.write(orjson.dumps({"error": str(e)}) + b"\n")
         sys.exit(1)
@@ -8,30 +8,51 @@ Features:
 - Background task processing with polling
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueHandler, QueueListener
 import logging
+import multiprocessing
 import os
+import queue
 import asyncio
+import gzip
+import re
+import tempfile
+import threading
+import time
 import uuid
-import json
+import msgspec
+import orjson
 from datetime import datetime
+from urllib.parse import urlparse, urlsplit, urlunsplit
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+# Records are handed to a background thread that does the actual writes, so
+# logging from the event loop never blocks on stderr
+_log_handlers = logging.getLogger().handlers[:]
+_log_queue = queue.SimpleQueue()
+logging.getLogger().handlers = [QueueHandler(_log_queue)]
+log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 # Import scrapers
-from scraper import scrape_url
+from scraper import scrape_url, use_direct_logging, ScrapeCancelled
+from task_store import TaskStore, TERMINAL_STATUSES
 
 # Try to import Architonic scraper
 try:
-    from architonic_scraper import scrape_architonic
+    from architonic_scraper import scrape_architonic, close_session as close_architonic_session
     HAS_ARCHITONIC = True
 except ImportError:
     HAS_ARCHITONIC = False
@@ -40,9 +61,76 @@ except ImportError:
 app = FastAPI(
     title="Python Scraper Service",
     description="Railway-deployed scraper service for BOQ application",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Universal scrapes drive a browser and parse pages synchronously; run them in
+# worker processes so parsing isn't serialized on the GIL. The Architonic
+# scraper is async and runs on the event loop. Each worker keeps a headless browser
+# open once it has needed one, so the default is small and fixed: os.cpu_count()
+# reports the host's CPUs inside a container, not the container's memory budget.
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "2"))
+# Workers are started lazily, from inside the running event loop of a process that
+# already has logging, save and threadpool threads and may hold the Architonic
+# browser driver's pipes. Forking that would copy the pipe fds into every worker,
+# so the driver never sees EOF when its browser is closed. A forkserver starts
+# workers from a clean process instead, with the scraper module already imported.
+_mp_context = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+if _mp_context.get_start_method() == "forkserver":
+    _mp_context.set_forkserver_preload(["scraper"])
+
+def new_scraper_pool():
+    return ProcessPoolExecutor(
+        max_workers=SCRAPER_WORKERS, mp_context=_mp_context, initializer=use_direct_logging
+    )
+
+@app.on_event("startup")
+def start_scraper_pool():
+    app.state.pool = new_scraper_pool()
+    # Serves the cancel flags that pool workers poll between pages
+    app.state.manager = _mp_context.Manager()
+
+def replace_scraper_pool(broken):
+    """Swap in a fresh pool for one whose worker died. Scrapes that failed on the same
+    broken pool all call this; only the first one replaces it."""
+    if app.state.pool is broken:
+        broken.shutdown(wait=False, cancel_futures=True)
+        app.state.pool = new_scraper_pool()
+
+async def scrape_in_pool(url: str, register_cancel=None):
+    """Run a universal scrape in the worker pool. A worker that dies (e.g. Chromium
+    OOM-killed or crashing) breaks the whole pool, so the pool is replaced and the
+    scrape retried once. register_cancel receives the current attempt's stop callable."""
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = app.state.pool
+        cancel_event = app.state.manager.Event()
+        if register_cancel is not None:
+            register_cancel(cancel_event.set)
+        try:
+            return await loop.run_in_executor(pool, scrape_url, url, cancel_event)
+        except BrokenProcessPool:
+            logger.warning(f"Scraper pool broke while scraping {url}; starting a new one")
+            replace_scraper_pool(pool)
+            if cancel_event.is_set():
+                raise ScrapeCancelled(url)
+            if attempt:
+                raise
+
+@app.on_event("shutdown")
+def stop_scraper_pool():
+    app.state.pool.shutdown(wait=False, cancel_futures=True)
+    app.state.manager.shutdown()
+
+@app.on_event("shutdown")
+async def stop_architonic_browser():
+    # The Architonic scraper keeps one browser open across requests
+    if HAS_ARCHITONIC:
+        await close_architonic_session()
+
 # CORS for cross-origin requests from Vercel
 app.add_middleware(
     CORSMiddleware,
@@ -52,17 +140,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Task storage
-tasks: Dict[str, Dict[str, Any]] = {}
+# Task storage - sharded and expiring so finished tasks don't accumulate in memory.
+# Sync endpoints run in the threadpool, so the store does its own locking.
+TASK_TTL_SECONDS = int(os.getenv("TASK_TTL_SECONDS", "3600"))
+
+def discard_task_result(task_id: str, state: dict):
+    """Delete a task's payload file once the task expires or is evicted"""
+    result_path = state.get("resultPath")
+    if not result_path:
+        return
+    try:
+        os.remove(result_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove result file for task {task_id}: {e}")
+
+tasks = TaskStore(ttl=TASK_TTL_SECONDS, on_evict=discard_task_result)
+
+# task_id -> one asyncio.Event per open /stream connection. Kept out of the task
+# state, which is returned as JSON. Only touched from the event loop.
+task_listeners = {}
+# task_id -> callable that stops the running scrape, for DELETE /tasks/{id}
+cancel_handles = {}
+SSE_KEEPALIVE_SECONDS = 15
+
+def update_task(task_id: str, fields: dict):
+    """Merge fields into a task and wake any /stream listeners"""
+    state = tasks.update(task_id, fields)
+    for event in task_listeners.get(task_id, ()):
+        event.set()
+    return state
 
 # ===================== MODELS =====================
 
-class ScrapeRequest(BaseModel):
+# msgspec structs: decoding and validating the body is a single C call per request
+class ScrapeRequest(msgspec.Struct):
     url: str
     name: Optional[str] = None
     sync: bool = False  # If True, wait for result. If False, return taskId
 
-class TaskResponse(BaseModel):
+class TaskResponse(msgspec.Struct):
     id: str
     status: str
     progress: int
@@ -73,6 +191,16 @@ class TaskResponse(BaseModel):
     productCount: Optional[int] = None
     error: Optional[str] = None
 
+_scrape_request_decoder = msgspec.json.Decoder(ScrapeRequest)
+
+async def scrape_request_body(request: Request) -> ScrapeRequest:
+    """Decode a ScrapeRequest body, bypassing FastAPI's pydantic validation"""
+    try:
+        return _scrape_request_decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        # ValidationError subclasses DecodeError; mirror FastAPI's status for bad bodies
+        raise HTTPException(status_code=422, detail=str(e))
+
 # ===================== HEALTH CHECK =====================
 
 @app.get("/health")
@@ -91,39 +219,140 @@ def health():
 
 @app.get("/tasks/{task_id}")
 def get_task(task_id: str):
-    if task_id not in tasks:
+    task = tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    # Completed results live on disk; let the server stream the file as-is
+    result_path = task.pop("resultPath", None)
+    if task.get("status") == "completed" and result_path:
+        if not os.path.exists(result_path):
+            raise HTTPException(status_code=404, detail="Task result no longer available")
+        return FileResponse(result_path, media_type="application/json")
+    return task
+
+@app.get("/tasks/{task_id}/stream")
+async def stream_task(task_id: str):
+    """Push task progress as Server-Sent Events until the task finishes"""
+    if tasks.get(task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks[task_id]
+    
+    async def events():
+        event = asyncio.Event()
+        task_listeners.setdefault(task_id, set()).add(event)
+        try:
+            while True:
+                event.clear()
+                task = tasks.get(task_id)
+                if task is None:
+                    break
+                # Completed payloads are fetched from /tasks/{id}; the stream only carries the summary
+                task.pop("resultPath", None)
+                yield b"data: " + orjson.dumps(task) + b"\n\n"
+                if task.get("status") in TERMINAL_STATUSES:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            listeners = task_listeners.get(task_id)
+            if listeners is not None:
+                listeners.discard(event)
+                if not listeners:
+                    del task_listeners[task_id]
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.delete("/tasks/{task_id}")
-def cancel_task(task_id: str):
-    if task_id not in tasks:
+async def cancel_task(task_id: str):
+    if tasks.get(task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    tasks[task_id]["status"] = "cancelled"
-    tasks[task_id]["stage"] = "Cancelled by user"
+    update_task(task_id, {"status": "cancelled", "stage": "Cancelled by user"})
+    stop = cancel_handles.get(task_id)
+    if stop is not None:
+        stop()
     logger.info(f"Task {task_id} cancelled")
     return {"success": True, "message": "Task cancelled"}
 
 # Persistent storage setup
 DATA_DIR = os.getenv("DATA_DIR", "/app/data")
 BRANDS_DIR = os.path.join(DATA_DIR, "brands")
+# Scratch space for completed task payloads served by /tasks/{id}
+TASKS_DIR = os.getenv("TASKS_DIR", "/tmp/tasks")
 
 # Ensure directories exist
 os.makedirs(BRANDS_DIR, exist_ok=True)
+os.makedirs(TASKS_DIR, exist_ok=True)
 logger.info(f"Persistent storage initialized at {DATA_DIR}")
 
+def sweep_stale_task_results():
+    """Remove payload files older than the task TTL. The in-memory store doesn't
+    survive a restart, so files written by a previous run are never evicted."""
+    cutoff = time.time() - TASK_TTL_SECONDS
+    with os.scandir(TASKS_DIR) as it:
+        for entry in it:
+            try:
+                if entry.name.endswith('.json') and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+sweep_stale_task_results()
+
+# Disk writes run here so the event loop and task runner never wait on them
+SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="brand-save")
+
+@app.on_event("shutdown")
+def flush_pending_saves():
+    SAVE_POOL.shutdown(wait=True)
+
+@app.on_event("shutdown")
+def stop_log_listener():
+    # Registered last so the other shutdown hooks' messages are written out
+    log_listener.stop()
+
+def write_file_bytes(filepath: str, payload: bytes, durable: bool = False):
+    """Write an already-serialized payload with one unbuffered write() call.
+    Goes through a temp file and rename, so readers see the old file or the new one, never a partial write.
+    durable fsyncs before the rename, for files that must survive a crash."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), prefix=".", suffix=".tmp")
+    try:
+        try:
+            view = memoryview(payload)
+            while view:  # write() may be short on some filesystems
+                view = view[os.write(fd, view):]
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+_UNSAFE_FILENAME_RE = re.compile(r'\W+')
+
 def save_brand_to_storage(brand_name: str, data: dict):
     """Save completed task data to persistent storage"""
     try:
-        safe_name = "".join(x for x in brand_name if x.isalnum() or x == "_").lower()
-        if not safe_name:
-            safe_name = "unknown_brand"
+        safe_name = _UNSAFE_FILENAME_RE.sub('', brand_name).lower() or "unknown_brand"
             
-        filename = f"{safe_name}_{int(datetime.utcnow().timestamp())}.json"
+        # Product lists are mostly repeated URL prefixes and compress several-fold
+        filename = f"{safe_name}_{int(datetime.utcnow().timestamp())}.json.gz"
         filepath = os.path.join(BRANDS_DIR, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_file_bytes(filepath, gzip.compress(orjson.dumps(data), compresslevel=6), durable=True)
+        # Index the summary so /brands never has to parse product lists
+        append_brand_rollup(brand_summary(filename, data))
             
         logger.info(f"💾 Brand saved to persistent storage: {filepath}")
         return filepath
@@ -131,35 +360,105 @@ def save_brand_to_storage(brand_name: str, data: dict):
         logger.error(f"Failed to save brand to storage: {e}")
         return None
 
+# Brand summaries are appended to one NDJSON file per day, so listing is a few
+# sequential reads instead of an open() per brand
+_rollup_lock = threading.Lock()
+
+def append_brand_rollup(summary: dict):
+    """Append a brand summary line to today's rollup"""
+    path = os.path.join(BRANDS_DIR, f"brands_{datetime.utcnow():%Y%m%d}.ndjson")
+    with _rollup_lock:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, orjson.dumps(summary) + b"\n")
+        finally:
+            os.close(fd)
+
+def is_brand_payload(filename: str) -> bool:
+    return filename.endswith(('.json', '.json.gz'))
+
+def read_brand_file(filepath: str) -> dict:
+    """Parse a saved brand payload, gzip-compressed or legacy plain JSON"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(gzip.decompress(raw) if filepath.endswith('.gz') else raw)
+
+def brand_summary(filename: str, data: dict) -> dict:
+    """Listing entry for a saved brand payload"""
+    return {
+        "filename": filename,
+        "name": data.get("brandInfo", {}).get("name") or data.get("brandName", "Unknown"),
+        "productCount": data.get("productCount", 0),
+        "completedAt": data.get("completedAt"),
+        "logo": data.get("brandInfo", {}).get("logo", "")
+    }
+
+def save_task_result(task_id: str, data: dict):
+    """Write a completed task payload to disk so it doesn't stay in memory"""
+    filepath = os.path.join(TASKS_DIR, f"{task_id}.json")
+    write_file_bytes(filepath, orjson.dumps(data))
+    return filepath
+
+# /brands listing cache; adding or removing a brand file bumps the directory mtime
+_brands_cache = None
+_brands_cache_mtime = 0
+_brands_cache_lock = threading.Lock()
+
 def load_saved_brands():
     """Load list of all saved brands"""
+    global _brands_cache, _brands_cache_mtime
     try:
         if not os.path.exists(BRANDS_DIR):
             return []
-            
-        files = [f for f in os.listdir(BRANDS_DIR) if f.endswith('.json')]
-        brands = []
         
-        for filename in files:
-            try:
-                filepath = os.path.join(BRANDS_DIR, filename)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    brands.append({
-                        "filename": filename,
-                        "name": data.get("brandInfo", {}).get("name") or data.get("brandName", "Unknown"),
-                        "productCount": data.get("productCount", 0),
-                        "completedAt": data.get("completedAt"),
-                        "logo": data.get("brandInfo", {}).get("logo", "")
-                    })
-            except Exception:
-                continue
-                
-        return brands
+        # Held while rebuilding so concurrent pollers wait for one scan instead of each doing their own
+        with _brands_cache_lock:
+            mtime = os.stat(BRANDS_DIR).st_mtime_ns
+            if _brands_cache is None or mtime != _brands_cache_mtime:
+                _brands_cache = scan_saved_brands()
+                _brands_cache_mtime = mtime
+            return _brands_cache
     except Exception as e:
         logger.error(f"Failed to load saved brands: {e}")
         return []
 
+def scan_saved_brands():
+    """Read the summary of every saved brand file"""
+    # scandir entries carry the file type and cache stat(), so no per-file lookups
+    with os.scandir(BRANDS_DIR) as it:
+        entries = {e.name: e for e in it if e.is_file(follow_symlinks=False) and e.name.endswith(('.json', '.json.gz', '.ndjson'))}
+    
+    summaries = {}
+    for name in sorted(n for n in entries if n.endswith('.ndjson')):
+        try:
+            with open(entries[name].path, 'rb') as f:
+                for line in f:
+                    try:
+                        summary = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue  # torn final line from a crash mid-append
+                    summaries[summary.get("filename")] = summary
+        except OSError:
+            continue
+    
+    brands = []
+    # Only payloads still on disk are listed, so deleted brands drop out of the rollups
+    for filename, entry in entries.items():
+        if not is_brand_payload(filename):
+            continue
+        try:
+            summary = summaries.get(filename)
+            if summary is None:
+                # Saved before the rollup existed: parse the payload itself
+                summary = brand_summary(filename, read_brand_file(entry.path))
+            if not summary.get("completedAt"):
+                summary["completedAt"] = datetime.utcfromtimestamp(entry.stat().st_mtime).isoformat()
+            brands.append(summary)
+        except Exception:
+            continue
+    
+    return brands
+
 # ===================== PERSISTENT STORAGE ENDPOINTS =====================
 
 @app.get("/brands")
@@ -173,15 +472,21 @@ def list_saved_brands():
     }
 
 @app.get("/brands/{filename}")
-def get_saved_brand(filename: str):
+def get_saved_brand(filename: str, request: Request):
     """Get content of a specific saved brand file"""
     try:
         filepath = os.path.join(BRANDS_DIR, filename)
         if not os.path.exists(filepath):
             raise HTTPException(status_code=404, detail="Brand file not found")
-            
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        
+        # Compressed payloads go out as stored when the client accepts gzip.
+        # The body depends on Accept-Encoding, so caches must key on it.
+        if filepath.endswith('.gz'):
+            if 'gzip' in request.headers.get('accept-encoding', ''):
+                return FileResponse(filepath, media_type="application/json",
+                                    headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+            return ORJSONResponse(read_brand_file(filepath), headers={"Vary": "Accept-Encoding"})
+        return read_brand_file(filepath)
     except HTTPException:
         raise
     except Exception as e:
@@ -201,31 +506,107 @@ def delete_saved_brand(filename: str):
 
 # ===================== SCRAPING ENDPOINTS =====================
 
-def run_scrape_task(task_id: str, url: str, name: Optional[str], scraper_type: str = "universal"):
+# Recent scrape results, so retries and repeat requests for the same brand skip
+# the crawl. Only touched from the event loop.
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+RESULT_CACHE_SIZE = 32
+_result_cache = OrderedDict()  # (scraper_type, canonical url) -> (expires_at, result)
+
+def result_cache_key(scraper_type: str, url: str):
+    """Spellings of the same page (host case, trailing slash, fragment) share an entry"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return (scraper_type, url)
+    path = parts.path.rstrip('/') or '/'
+    return (scraper_type, urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, '')))
+
+def get_cached_result(scraper_type: str, url: str):
+    key = result_cache_key(scraper_type, url)
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _result_cache[key]
+        return None
+    _result_cache.move_to_end(key)
+    return entry[1]
+
+def cache_result(scraper_type: str, url: str, result: dict):
+    # An empty or partial crawl (blocked, bot challenge, pages timing out) is exactly
+    # what a retry should redo, so only complete results are kept
+    if RESULT_CACHE_TTL_SECONDS <= 0 or not result.get("products") or result.get("failedPages"):
+        return
+    key = result_cache_key(scraper_type, url)
+    _result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL_SECONDS, result)
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+@app.delete("/cache")
+async def clear_result_cache():
+    """Drop cached scrape results so the next request for any URL crawls afresh"""
+    cleared = len(_result_cache)
+    _result_cache.clear()
+    return {"success": True, "message": f"Cleared {cleared} cached results"}
+
+def _is_architonic(url: str) -> bool:
+    """True when the URL's host is architonic.com (or a subdomain)"""
+    try:
+        host = urlparse(url).hostname or ''
+        return host == 'architonic.com' or host.endswith('.architonic.com')
+    except Exception:
+        return False
+
+async def run_scrape_task(task_id: str, url: str, name: Optional[str], scraper_type: str = "universal"):
     """Background task to run scraping"""
+    def is_cancelled():
+        task = tasks.get(task_id)
+        return task is not None and task.get("status") == "cancelled"
+    
+    loop = asyncio.get_running_loop()
     try:
-        tasks[task_id]["status"] = "processing"
-        tasks[task_id]["progress"] = 20
-        tasks[task_id]["stage"] = f"Running {scraper_type} scraper..."
-        
         # Check for cancellation
-        if tasks[task_id]["status"] == "cancelled":
+        if is_cancelled():
             return
         
-        # Run appropriate scraper
-        if scraper_type == "architonic" and HAS_ARCHITONIC:
-            result = scrape_architonic(url)
-        else:
-            result = scrape_url(url)
+        update_task(task_id, {
+            "status": "processing",
+            "progress": 20,
+            "stage": f"Running {scraper_type} scraper..."
+        })
+        
+        # Run appropriate scraper, registering a way for cancel_task to stop it mid-crawl
+        result = get_cached_result(scraper_type, url)
+        if result is None:
+            if scraper_type == "architonic" and HAS_ARCHITONIC:
+                scrape = asyncio.ensure_future(scrape_architonic(url))
+                cancel_handles[task_id] = scrape.cancel
+                try:
+                    result = await scrape
+                except asyncio.CancelledError:
+                    if is_cancelled():
+                        return
+                    raise
+            else:
+                def register_cancel(stop):
+                    cancel_handles[task_id] = stop
+                try:
+                    result = await scrape_in_pool(url, register_cancel)
+                except ScrapeCancelled:
+                    return
+            cache_result(scraper_type, url, result)
         
         # Check for cancellation again
-        if tasks[task_id]["status"] == "cancelled":
+        if is_cancelled():
             return
         
         products = result.get("products", [])
         brand_info = result.get("brandInfo", {"name": name or "Unknown", "logo": ""})
         
+        # Merged over the task so the payload keeps brandName and startedAt
         completed_data = {
+            **(tasks.get(task_id) or {}),
             "id": task_id,
             "status": "completed",
             "progress": 100,
@@ -237,60 +618,74 @@ def run_scrape_task(task_id: str, url: str, name: Optional[str], scraper_type: s
             "sourceUrl": url
         }
         
-        # Update in-memory task
-        tasks[task_id].update(completed_data)
+        # Keep only the summary in memory; the full payload is served from disk.
+        # update() recreates the entry if a long scrape outlived its eviction.
+        result_path = await loop.run_in_executor(SAVE_POOL, save_task_result, task_id, completed_data)
+        summary = {k: v for k, v in completed_data.items() if k != "products"}
+        summary["resultPath"] = result_path
+        update_task(task_id, summary)
         
-        # PERSIST: Save to disk
+        # PERSIST: Save to disk in the background; pollers already see completion
         brand_name_to_save = brand_info.get("name") or name or "Unknown"
-        save_brand_to_storage(brand_name_to_save, completed_data)
+        SAVE_POOL.submit(save_brand_to_storage, brand_name_to_save, completed_data)
         
-        logger.info(f"Task {task_id} completed: {len(products)} products (SAVED TO DISK)")
+        logger.info(f"Task {task_id} completed: {len(products)} products (saving to disk)")
         
     except Exception as e:
         logger.error(f"Task {task_id} failed: {e}")
-        tasks[task_id].update({
+        update_task(task_id, {
             "status": "failed",
             "error": str(e),
             "failedAt": datetime.utcnow().isoformat()
         })
+    finally:
+        cancel_handles.pop(task_id, None)
+
+def sync_scrape_response(data: dict) -> ORJSONResponse:
+    """Sync-mode body. Returned as a response object so FastAPI hands it straight to
+    orjson instead of first walking every product through jsonable_encoder."""
+    products = data.get("products", [])
+    return ORJSONResponse({
+        "success": True,
+        "products": products,
+        "brandInfo": data.get("brandInfo", {}),
+        "productCount": len(products)
+    })
 
 @app.post("/scrape")
-async def scrape_endpoint(req: ScrapeRequest, background_tasks: BackgroundTasks):
+async def scrape_endpoint(background_tasks: BackgroundTasks, req: ScrapeRequest = Depends(scrape_request_body)):
     """Universal scraping endpoint"""
     logger.info(f"Received scrape request for: {req.url}")
     
     # Detect if Architonic
-    is_architonic = "architonic.com" in req.url.lower()
+    is_architonic = _is_architonic(req.url)
     scraper_type = "architonic" if is_architonic and HAS_ARCHITONIC else "universal"
     
     # Sync mode - wait for result
     if req.sync:
         try:
-            loop = asyncio.get_event_loop()
-            if scraper_type == "architonic":
-                data = await loop.run_in_executor(None, scrape_architonic, req.url)
-            else:
-                data = await loop.run_in_executor(None, scrape_url, req.url)
-            return {
-                "success": True,
-                "products": data.get("products", []),
-                "brandInfo": data.get("brandInfo", {}),
-                "productCount": len(data.get("products", []))
-            }
+            data = get_cached_result(scraper_type, req.url)
+            if data is None:
+                if scraper_type == "architonic":
+                    data = await scrape_architonic(req.url)
+                else:
+                    data = await scrape_in_pool(req.url)
+                cache_result(scraper_type, req.url, data)
+            return sync_scrape_response(data)
         except Exception as e:
             logger.error(f"Sync scrape failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     # Async mode - create task and return immediately
     task_id = f"py_{scraper_type}_{uuid.uuid4().hex[:8]}"
-    tasks[task_id] = {
+    tasks.set(task_id, {
         "id": task_id,
         "status": "processing",
         "progress": 10,
         "stage": f"Initializing {scraper_type} scraper...",
         "brandName": req.name or "Detecting...",
         "startedAt": datetime.utcnow().isoformat()
-    }
+    })
     
     # Run in background
     background_tasks.add_task(run_scrape_task, task_id, req.url, req.name, scraper_type)
@@ -302,7 +697,7 @@ async def scrape_endpoint(req: ScrapeRequest, background_tasks: BackgroundTasks)
     }
 
 @app.post("/scrape-architonic")
-async def scrape_architonic_endpoint(req: ScrapeRequest, background_tasks: BackgroundTasks):
+async def scrape_architonic_endpoint(background_tasks: BackgroundTasks, req: ScrapeRequest = Depends(scrape_request_body)):
     """Architonic-specific scraping endpoint"""
     if not HAS_ARCHITONIC:
         raise HTTPException(
@@ -310,7 +705,7 @@ async def scrape_architonic_endpoint(req: ScrapeRequest, background_tasks: Backg
             detail="Architonic scraper not available. Use /scrape instead."
         )
     
-    if "architonic.com" not in req.url.lower():
+    if not _is_architonic(req.url):
         raise HTTPException(status_code=400, detail="URL must be from architonic.com")
     
     logger.info(f"Received Architonic scrape request for: {req.url}")
@@ -318,28 +713,25 @@ async def scrape_architonic_endpoint(req: ScrapeRequest, background_tasks: Backg
     # Sync mode
     if req.sync:
         try:
-            loop = asyncio.get_event_loop()
-            data = await loop.run_in_executor(None, scrape_architonic, req.url)
-            return {
-                "success": True,
-                "products": data.get("products", []),
-                "brandInfo": data.get("brandInfo", {}),
-                "productCount": len(data.get("products", []))
-            }
+            data = get_cached_result("architonic", req.url)
+            if data is None:
+                data = await scrape_architonic(req.url)
+                cache_result("architonic", req.url, data)
+            return sync_scrape_response(data)
         except Exception as e:
             logger.error(f"Architonic scrape failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     # Async mode
     task_id = f"py_architonic_{uuid.uuid4().hex[:8]}"
-    tasks[task_id] = {
+    tasks.set(task_id, {
         "id": task_id,
         "status": "processing",
         "progress": 10,
         "stage": "Initializing Architonic crawler...",
         "brandName": req.name or "Detecting...",
         "startedAt": datetime.utcnow().isoformat()
-    }
+    })
     
     background_tasks.add_task(run_scrape_task, task_id, req.url, req.name, "architonic")
     
@@ -355,4 +747,9 @@ if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
     logger.info(f"Starting Python Scraper Service on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Single worker: task state lives in this process. Keep-alive outlasts the
+    # frontend's polling interval so pollers reuse their connection.
+    uvicorn.run(
+        app, host="0.0.0.0", port=port, loop="uvloop", http="httptools",
+        backlog=2048, timeout_keep_alive=75
+    )
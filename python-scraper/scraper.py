@@ -1,32 +1,136 @@
 import sys
-import json
+import os
+import re
+import asyncio
+import gzip
 import logging
-from urllib.parse import urljoin, urlparse
+import logging.handlers
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from hashlib import blake2b
+from urllib.parse import urljoin, urlparse, urlsplit
+
+import orjson
 
 # Configure logging to console
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 try:
-    from scrapling import DynamicFetcher
+    from scrapling.fetchers import AsyncDynamicSession, AsyncFetcher
 except ImportError as e:
     logger.error(f"CRITICAL: Failed to import scrapling: {e}")
     import traceback
     logger.error(traceback.format_exc())
-    DynamicFetcher = None
+    AsyncDynamicSession = None
+    AsyncFetcher = None
+
+try:
+    from scrapling.parser import Selector
+except ImportError:
+    Selector = None
+
+try:
+    from scrapling.fetchers import FetcherSession
+except ImportError:  # older scrapling: every static fetch opens its own connection
+    FetcherSession = None
+
+try:
+    import uvloop
+except ImportError:  # e.g. Windows; the stock loop works, just slower
+    uvloop = None
 
 # === CONFIGURATION ===
+# Category pages fetched in parallel per crawl
+CRAWL_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "5"))
+# Optional on-disk cache of static page HTML, so re-running a crawl (retries,
+# development) doesn't refetch every page. Unset disables it.
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR")
+PAGE_CACHE_TTL_SECONDS = int(os.getenv("PAGE_CACHE_TTL_SECONDS", "86400"))
 PRODUCT_KEYWORDS = ['product', 'products', 'item', 'shop', 'collection', 'category', 'furniture', 'chair', 'desk', 'table', 'seating']
 EXCLUDE_KEYWORDS = ['contact', 'about', 'login', 'cart', 'privacy', 'social', 'news', 'blog', 'terms', 'careers', 'account', 'faq', 'instagram', 'facebook', 'twitter', 'youtube', 'linkedin']
+# Client-rendered apps ship an empty mount point; those pages need the browser
+SPA_SHELL_SELECTOR = '#root:empty, #app:empty, #__next:empty, #__nuxt:empty'
+# Placeholder category names that lose to a real one when deduplicating products
+GENERIC_CATEGORIES = frozenset({'homepage', 'products', 'general', 'select category'})
+# Strategy 1 stops trying further card selectors once it has this many products
+MIN_CARD_GRID_PRODUCTS = 8
+# Where a WooCommerce-style product card keeps its name, tried in order
+TITLE_SELECTORS = ('h2::text', 'h3::text', '.woocommerce-loop-product__title::text', '.product-title::text', '.title::text', 'a::attr(title)')
+# Category-page widgets listing a category's children, tried in order
+SUBCATEGORY_SELECTORS = (
+    '.product-categories a',
+    '.woocommerce-loop-category a',
+    'ul.product-categories a',
+    '.widget_product_categories a',
+    '.category-list a',
+    'aside a[href*="product-category"]',
+    'a[href*="product-category"]',
+)
+# Generic product blocks: any div/li/article/section holding both an image and a link
+GENERIC_CONTAINERS_XPATH = '(//div | //li | //article | //section)[.//img and .//a[@href]]'
+# Pagination link hrefs, tried in order
+PAGINATION_HREF_SELECTORS = tuple(f'{sel}::attr(href)' for sel in (
+    '.pagination a', '.pager a', 'a[class*="page"]', 'a[href*="page="]', 'a.next', 'a[rel="next"]'
+))
 IMAGE_EXCLUDE = ['logo', 'icon', 'arrow', 'chevron', 'placeholder', 'blank', 'loading', 'spinner', 'social', 'banner']
 
+# Keyword lists as single alternations: one C-level scan per string instead of
+# one Python-level substring test per keyword. Match against lowercased text.
+PRODUCT_KEYWORDS_RE = re.compile('|'.join(map(re.escape, PRODUCT_KEYWORDS)))
+EXCLUDE_RE = re.compile('|'.join(map(re.escape, EXCLUDE_KEYWORDS)))
+IMAGE_EXCLUDE_RE = re.compile('|'.join(map(re.escape, IMAGE_EXCLUDE)))
+# First candidate URL of a srcset ("a.jpg 300w, b.jpg 600w" -> "a.jpg")
+SRCSET_FIRST_URL_RE = re.compile(r'\s*([^\s,]+)')
+# hrefs join_url must hand to urljoin: dot segments need its normalization,
+# it strips tabs and newlines from anywhere in the URL, and it rejects
+# malformed IPv6 hosts (e.g. "http://[::1/x") with ValueError
+NEEDS_URLJOIN_RE = re.compile(r'/\.|[\t\r\n\[\]]')
+
+
+class ScrapeCancelled(Exception):
+    """Raised by scrape_url when its cancel event is set."""
+
+
+@lru_cache(maxsize=64)
+def url_origin(url):
+    """scheme://host[:port] of a URL"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+@lru_cache(maxsize=8192)
+def join_url(base, href):
+    """urljoin, memoized: a crawl resolves the same nav, pagination and CDN hrefs
+    against the same base on every page. Absolute and root-relative hrefs skip
+    the parse entirely unless they need urljoin's cleanup."""
+    if not NEEDS_URLJOIN_RE.search(href):
+        if href.startswith(('http://', 'https://')):
+            return href
+        if href.startswith('/') and not href.startswith('//'):
+            return url_origin(base) + href
+    return urljoin(base, href)
+
+
+def first_attr(elements, *names):
+    """First non-empty value of the highest-priority attribute any of the elements carries.
+    Reads the already-selected elements' attributes instead of running one query per name."""
+    for name in names:
+        for el in elements:
+            value = el.attrib.get(name)
+            if value:
+                return value
+    return None
+
 
 def is_valid_product_image(url):
     """Check if image URL is likely a product image, not UI element."""
     if not url or len(url) < 10:
         return False
     lower = url.lower()
-    return not any(term in lower for term in IMAGE_EXCLUDE)
+    return IMAGE_EXCLUDE_RE.search(lower) is None
 
 
 def parse_woocommerce_category_url(url):
@@ -36,7 +140,6 @@ def parse_woocommerce_category_url(url):
     e.g., /chairs/stool/ -> ('Chairs', 'Stool')
     """
     try:
-        from urllib.parse import urlparse
         path = urlparse(url).path.strip('/')
         parts = [p for p in path.split('/') if p and p != 'product-category']
         
@@ -48,7 +151,7 @@ def parse_woocommerce_category_url(url):
         elif len(parts) == 1:
             cat = parts[0].replace('-', ' ').title()
             return cat, cat
-    except:
+    except ValueError:  # malformed URL
         pass
     return None, None
 
@@ -75,7 +178,10 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
     Mirrors the approach from structureScraper.js.
     """
     products = []
+    # Product URLs (returned, so the crawl doesn't revisit them) and lowercased names,
+    # kept apart so a name can never be mistaken for a URL
     seen = set()
+    seen_titles = set()
     
     # === STRATEGY 1: WooCommerce product containers ===
     woo_selectors = [
@@ -97,7 +203,7 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                     try:
                         # Extract title
                         title = None
-                        for title_sel in ['h2::text', 'h3::text', '.woocommerce-loop-product__title::text', '.product-title::text', '.title::text', 'a::attr(title)']:
+                        for title_sel in TITLE_SELECTORS:
                             title = container.css(title_sel).get()
                             if title and len(title.strip()) > 2:
                                 title = title.strip()
@@ -109,21 +215,23 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                             if link_text and len(link_text.strip()) > 2:
                                 title = link_text.strip()
                         
-                        if not title or title.lower() in seen:
+                        if not title:
+                            continue
+                        title_key = title.lower()
+                        if title_key in seen_titles:
                             continue
                         
                         # Extract image
-                        img_src = (
-                            container.css('img::attr(src)').get() or
-                            container.css('img::attr(data-src)').get() or
-                            container.css('img::attr(data-lazy-src)').get()
-                        )
+                        imgs = container.css('img')
+                        img_src = first_attr(imgs, 'src', 'data-src', 'data-lazy-src')
                         
                         # Check srcset for better quality
-                        srcset = container.css('img::attr(srcset)').get()
+                        srcset = first_attr(imgs, 'srcset')
                         if srcset:
                             # Take the first URL from srcset
-                            img_src = srcset.split(',')[0].strip().split(' ')[0] or img_src
+                            first = SRCSET_FIRST_URL_RE.match(srcset)
+                            if first:
+                                img_src = first.group(1)
                         
                         if not img_src or not is_valid_product_image(img_src):
                             continue
@@ -133,13 +241,13 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                         if not product_url:
                             continue
                         
-                        full_img = urljoin(base_url, img_src)
-                        full_url = urljoin(base_url, product_url)
+                        full_img = join_url(base_url, img_src)
+                        full_url = join_url(base_url, product_url)
                         
                         if full_url in seen:
                             continue
                         
-                        seen.add(title.lower())
+                        seen_titles.add(title_key)
                         seen.add(full_url)
                         
                         products.append(create_product(
@@ -151,8 +259,13 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                             sub_category=sub_category
                         ))
                         
-                    except Exception as e:
+                    except ValueError:  # urljoin rejects malformed hrefs, e.g. a broken IPv6 host
                         continue
+                
+                # The broader selectors below mostly re-match the same cards; once one
+                # has produced a real grid, skip re-walking the document for them
+                if len(products) >= MIN_CARD_GRID_PRODUCTS:
+                    break
                         
         except Exception as e:
             continue
@@ -160,20 +273,14 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
     # === STRATEGY 2: Generic container detection (like structureScraper.js) ===
     if len(products) < 5:
         try:
-            # Look for div/li/article that contains both img and link
-            containers = page.css('div, li, article, section')
+            # Look for div/li/article that contains both img and link; the XPath
+            # predicate drops every other block element inside the parser
+            containers = page.xpath(GENERIC_CONTAINERS_XPATH)
             
             for container in containers:
                 try:
-                    # Must have image
                     img = container.css('img')
-                    if not img:
-                        continue
-                    
-                    # Must have link
                     link = container.css('a[href]')
-                    if not link:
-                        continue
                     
                     # Check for heading or substantial text
                     heading = container.css('h1, h2, h3, h4, h5, .title, .name')
@@ -186,14 +293,14 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                     if not title and len(link_text.strip()) > 5:
                         title = link_text.strip()
                     
-                    if not title or len(title) < 3 or title.lower() in seen:
+                    if not title or len(title) < 3:
+                        continue
+                    title_key = title.lower()
+                    if title_key in seen_titles:
                         continue
                     
                     # Get image
-                    img_src = (
-                        img.css('::attr(src)').get() or
-                        img.css('::attr(data-src)').get()
-                    )
+                    img_src = first_attr(img, 'src', 'data-src')
                     
                     if not img_src or not is_valid_product_image(img_src):
                         continue
@@ -203,17 +310,14 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                     if not href:
                         continue
                     
-                    full_url = urljoin(base_url, href)
-                    full_img = urljoin(base_url, img_src)
+                    full_url = join_url(base_url, href)
+                    full_img = join_url(base_url, img_src)
                     
+                    # Every product appended so far has its URL in seen
                     if full_url in seen:
                         continue
                     
-                    # Skip if already added
-                    if any(p['productUrl'] == full_url for p in products):
-                        continue
-                    
-                    seen.add(title.lower())
+                    seen_titles.add(title_key)
                     seen.add(full_url)
                     
                     products.append(create_product(
@@ -225,7 +329,7 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                         sub_category=sub_category
                     ))
                     
-                except:
+                except ValueError:  # malformed href
                     continue
                     
         except Exception as e:
@@ -234,13 +338,13 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
     # === STRATEGY 3: JSON-LD Structured Data ===
     try:
         scripts = page.css('script[type="application/ld+json"]::text').getall()
-        if not isinstance(scripts, list):
-            single = page.css('script[type="application/ld+json"]::text').get()
-            scripts = [single] if single else []
         
         for script in scripts:
+            # Most LD blocks are WebSite/BreadcrumbList/Organization; skip them without parsing
+            if not script or ('Product' not in script and 'ItemList' not in script):
+                continue
             try:
-                data = json.loads(script)
+                data = orjson.loads(script)
                 items = data.get('@graph', [data]) if isinstance(data, dict) else (data if isinstance(data, list) else [])
                 
                 for item in items:
@@ -262,10 +366,11 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                         p_url = item.get('url') or base_url
                         
                         if p_name and p_img:
-                            full_url = urljoin(base_url, p_url)
-                            full_img = urljoin(base_url, p_img)
+                            full_url = join_url(base_url, p_url)
+                            full_img = join_url(base_url, p_img)
                             
-                            if full_url not in seen and p_name.lower() not in seen:
+                            name_key = p_name.lower()
+                            if full_url not in seen and name_key not in seen_titles:
                                 products.append(create_product(
                                     name=p_name,
                                     image_url=full_img,
@@ -275,7 +380,7 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                                     sub_category=sub_category
                                 ))
                                 seen.add(full_url)
-                                seen.add(p_name.lower())
+                                seen_titles.add(name_key)
                     
                     elif item_type == 'ItemList':
                         for li in item.get('itemListElement', []):
@@ -287,8 +392,8 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                                     p_img = product.get('image')
                                     
                                     if p_name and p_url:
-                                        full_url = urljoin(base_url, p_url)
-                                        full_img = urljoin(base_url, p_img) if p_img else ""
+                                        full_url = join_url(base_url, p_url)
+                                        full_img = join_url(base_url, p_img) if p_img else ""
                                         
                                         if full_url not in seen:
                                             products.append(create_product(
@@ -300,7 +405,10 @@ def extract_products_from_page(page, base_url, brand_name, main_category='Genera
                                                 sub_category=sub_category
                                             ))
                                             seen.add(full_url)
-            except:
+            except (ValueError, IndexError, TypeError, AttributeError):
+                # Skip just this block: malformed JSON (orjson.JSONDecodeError is a ValueError)
+                # or an unjoinable URL, an empty "@type"/"image" list, or a field holding
+                # an unexpected type (e.g. a dict name)
                 continue
     except Exception as e:
         logger.warning(f"JSON-LD extraction error: {e}")
@@ -357,7 +465,7 @@ def discover_category_pages(page, base_url):
                         # Skip excluded
                         if not main_text or len(main_text) < 2:
                             continue
-                        if any(ex in main_text.lower() for ex in EXCLUDE_KEYWORDS):
+                        if EXCLUDE_RE.search(main_text.lower()):
                             continue
                         
                         # Check for submenu (dropdown items) - multiple patterns including Elementor
@@ -389,10 +497,10 @@ def discover_category_pages(page, base_url):
                                     
                                     if not sub_href or sub_href == '#' or not sub_text:
                                         continue
-                                    if any(ex in sub_text.lower() for ex in EXCLUDE_KEYWORDS):
+                                    if EXCLUDE_RE.search(sub_text.lower()):
                                         continue
                                     
-                                    full_url = urljoin(base_url, sub_href)
+                                    full_url = join_url(base_url, sub_href)
                                     
                                     if full_url not in seen and full_url != base_url:
                                         seen.add(full_url)
@@ -402,12 +510,12 @@ def discover_category_pages(page, base_url):
                                             "mainCategory": main_text,
                                             "subCategory": sub_text
                                         })
-                                except:
+                                except ValueError:  # malformed href
                                     continue
                         else:
                             # No submenu - add as main category only
                             if main_href and main_href != '#' and not main_href.startswith('javascript'):
-                                full_url = urljoin(base_url, main_href)
+                                full_url = join_url(base_url, main_href)
                                 if full_url not in seen and full_url != base_url:
                                     seen.add(full_url)
                                     categories.append({
@@ -440,7 +548,7 @@ def discover_category_pages(page, base_url):
                     text = link.css('::text').get() or ""
                     text = text.strip()
                     
-                    full_url = urljoin(base_url, href)
+                    full_url = join_url(base_url, href)
                     
                     if not full_url.startswith(base_url):
                         continue
@@ -451,10 +559,10 @@ def discover_category_pages(page, base_url):
                     href_lower = href.lower()
                     text_lower = text.lower()
                     
-                    if any(ex in href_lower for ex in EXCLUDE_KEYWORDS):
+                    if EXCLUDE_RE.search(href_lower):
                         continue
                     
-                    is_product_link = any(kw in href_lower or kw in text_lower for kw in PRODUCT_KEYWORDS)
+                    is_product_link = PRODUCT_KEYWORDS_RE.search(href_lower) or PRODUCT_KEYWORDS_RE.search(text_lower)
                     
                     if is_product_link and len(text) > 2 and len(text) < 50:
                         seen.add(full_url)
@@ -465,7 +573,7 @@ def discover_category_pages(page, base_url):
                             "subCategory": text if text else "Products"
                         })
                         
-                except:
+                except ValueError:  # malformed href
                     continue
                 
     except Exception as e:
@@ -481,20 +589,17 @@ def find_pagination(page, base_url):
     seen = set()
     
     try:
-        selectors = ['.pagination a', '.pager a', 'a[class*="page"]', 'a[href*="page="]', 'a.next', 'a[rel="next"]']
-        
-        for sel in selectors:
-            try:
-                links = page.css(sel)
-                for link in links:
-                    href = link.css('::attr(href)').get()
-                    if href and not href.startswith('#') and not href.startswith('javascript'):
-                        full_url = urljoin(base_url, href)
-                        if full_url.startswith(base_url) and full_url not in seen:
-                            seen.add(full_url)
-                            pagination_urls.append(full_url)
-            except:
-                continue
+        for sel in PAGINATION_HREF_SELECTORS:
+            # One query per selector straight to the href strings, no per-link selector objects
+            for href in page.css(sel).getall():
+                if href and not href.startswith(('#', 'javascript')):
+                    try:
+                        full_url = join_url(base_url, href)
+                    except ValueError:  # malformed href
+                        continue
+                    if full_url.startswith(base_url) and full_url not in seen:
+                        seen.add(full_url)
+                        pagination_urls.append(full_url)
                 
     except Exception as e:
         logger.warning(f"Pagination error: {e}")
@@ -502,15 +607,158 @@ def find_pagination(page, base_url):
     return pagination_urls[:10]  # Limit to 10 pages
 
 
-def scrape_url(url):
-    """Main scraping function."""
+def page_cache_path(url):
+    return os.path.join(PAGE_CACHE_DIR, blake2b(url.encode(), digest_size=16).hexdigest() + '.html.gz')
+
+
+def read_cached_page(url):
+    """Cached HTML for url as a Selector, or None when caching is off or the entry is missing or stale."""
+    if not PAGE_CACHE_DIR or Selector is None:
+        return None
+    path = page_cache_path(url)
+    try:
+        if time.time() - os.stat(path).st_mtime > PAGE_CACHE_TTL_SECONDS:
+            os.unlink(path)  # so the directory doesn't keep every page ever fetched
+            return None
+        with open(path, 'rb') as f:
+            html = gzip.decompress(f.read())
+    except (OSError, EOFError):  # missing, unreadable or truncated
+        return None
+    return Selector(html.decode('utf-8', 'replace'), url=url)
+
+
+def write_cached_page(url, html):
+    """Store a page's HTML; written to a temp file and renamed so readers never see a partial entry."""
+    tmp = None
+    try:
+        os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=PAGE_CACHE_DIR, prefix='.', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(gzip.compress(html.encode('utf-8'), compresslevel=6))
+        os.replace(tmp, page_cache_path(url))
+    except OSError as e:
+        # The cache is best-effort; the crawl carries on with the fetched page
+        logger.info(f"Page cache write failed for {url}: {e}")
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+async def fetch_static(url, client=None):
+    """Fetch a page over plain HTTP. Returns None if it needs JS to render.
+    client is an open FetcherSession to reuse connections; defaults to a one-off AsyncFetcher request."""
+    # Checked here so uncached deployments don't pay a thread hop per page
+    if PAGE_CACHE_DIR:
+        page = await asyncio.to_thread(read_cached_page, url)
+        if page is not None:
+            return page
+    client = client or AsyncFetcher
+    if client is None:
+        return None
+    try:
+        page = await client.get(url, timeout=15)
+    except Exception as e:
+        logger.info(f"Static fetch failed for {url}: {e}")
+        return None
+    if page.status != 200 or not page.css('a[href]') or page.css(SPA_SHELL_SELECTOR):
+        return None
+    if PAGE_CACHE_DIR:
+        await asyncio.to_thread(write_cached_page, url, page.html_content)
+    return page
+
+
+# Each pool worker keeps one event loop and, once a crawl has needed it, one browser
+# for its lifetime, so later crawls in the same worker skip the browser launch. The
+# browser's driver exits with the worker process.
+_worker_runner = None
+_browser_stack = AsyncExitStack()
+_browser = None
+
+
+async def get_browser():
+    """Return the worker's browser session, starting it on first use."""
+    global _browser
+    if _browser is None:
+        _browser = await _browser_stack.enter_async_context(
+            # Products are read from <img> attributes, so image/font/media/stylesheet
+            # downloads are pure overhead
+            AsyncDynamicSession(headless=True, max_pages=CRAWL_CONCURRENCY, disable_resources=True)
+        )
+    return _browser
+
+
+async def close_browser():
+    """Shut the worker's browser down; the next crawl that needs one starts a fresh one."""
+    global _browser
+    _browser = None
+    await _browser_stack.aclose()
+
+
+def use_direct_logging():
+    """Pool worker initializer: write log records straight to the handlers. main.py
+    routes the server's records through a queue drained by a thread that only
+    exists in the server process, so a queue handler here would drop them."""
+    root = logging.getLogger()
+    root.handlers = [h for h in root.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    if not root.handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def scrape_url(url, cancel_event=None):
+    """Synchronous entry point for process-pool workers; runs the crawl on the worker's own event loop."""
+    global _worker_runner
+    if _worker_runner is None:
+        _worker_runner = asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None)
+    return _worker_runner.run(scrape_url_async(url, cancel_event))
+
+
+async def scrape_url_async(url, cancel_event=None):
+    """Main scraping function.
+    cancel_event (threading.Event or a multiprocessing.Manager proxy) is checked between pages."""
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScrapeCancelled(url)
+    
+    # One HTTP session per crawl, so static fetches reuse their connections to the site
+    stack = AsyncExitStack()
+    http = None
+    
+    # The browser is started on the first page that needs it and kept for later crawls
+    browser_lock = asyncio.Lock()
+    page_slots = asyncio.Semaphore(CRAWL_CONCURRENCY)
+    
+    async def render(target):
+        async with browser_lock:
+            browser = await get_browser()
+        return await browser.fetch(target)
+    
     try:
         logger.info(f"Starting extraction for {url}")
+        if FetcherSession is not None:
+            http = await stack.enter_async_context(FetcherSession())
+        
+        async def fetch(target):
+            """Static HTML first; only render in the browser when the page is a JS shell.
+            Returns (page, rendered)."""
+            page = await fetch_static(target, http)
+            if page is not None:
+                return page, False
+            return await render(target), True
         
-        fetcher = DynamicFetcher(headless=True)
-        page = fetcher.fetch(url)
+        async def fetch_listing(target, main_cat, sub_cat):
+            """Fetch and extract a listing page, re-rendering it if the static HTML had no products (AJAX grids)"""
+            page, rendered = await fetch(target)
+            products, seen = extract_products_from_page(page, base_url, brand_name, main_cat, sub_cat)
+            if not products and not rendered:
+                page = await render(target)
+                products, seen = extract_products_from_page(page, base_url, brand_name, main_cat, sub_cat)
+            return page, products, seen
         
-        base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+        page, _ = await fetch(url)
+        
+        base_url = url_origin(url)
         
         # Brand Info
         title = page.css('title::text').get() or "Unknown Brand"
@@ -527,11 +775,14 @@ def scrape_url(url):
         for sel in logo_selectors:
             src = page.css(sel).get()
             if src:
-                logo = urljoin(url, src)
+                logo = join_url(url, src)
                 break
         
         all_products = []
         all_seen = set()
+        # Category and pagination pages that errored; reported so callers can tell
+        # a partial crawl from a complete one
+        failed_pages = 0
         
         # === PHASE 1: Extract from current page ===
         logger.info("Phase 1: Extracting from main page...")
@@ -548,20 +799,22 @@ def scrape_url(url):
         if len(categories) == 0:
             common_paths = ['/products/', '/product/', '/shop/', '/collection/', '/collections/', '/catalogue/']
             for path in common_paths:
-                try:
-                    test_url = urljoin(base_url, path)
-                    path_name = path.strip('/').title()
-                    categories.append({
-                        "url": test_url, 
-                        "title": path_name,
-                        "mainCategory": path_name,
-                        "subCategory": path_name
-                    })
-                except:
-                    continue
+                test_url = join_url(base_url, path)
+                path_name = path.strip('/').title()
+                categories.append({
+                    "url": test_url, 
+                    "title": path_name,
+                    "mainCategory": path_name,
+                    "subCategory": path_name
+                })
         
-        # Crawl discovered categories (limit to 30 for better coverage)
-        for cat in categories[:30]:
+        # Crawl discovered categories (limit to 30 for better coverage). Categories run
+        # concurrently, bounded by page_slots; results are merged in discovery order
+        # so the dedup below prefers the same entries as a sequential crawl would.
+        # Shared sets are only touched between awaits, so no locking is needed.
+        async def crawl_category(cat):
+            nonlocal failed_pages
+            found = []
             cat_url = cat['url']
             cat_title = cat.get('title', 'Products')
             main_cat = cat.get('mainCategory', cat_title)
@@ -574,30 +827,25 @@ def scrape_url(url):
                 sub_cat = url_sub
             
             if cat_url in all_seen:
-                continue
+                return found
             all_seen.add(cat_url)
             
             try:
                 logger.info(f"Crawling category: {main_cat} > {sub_cat} ({cat_url})")
-                cat_page = fetcher.fetch(cat_url)
+                async with page_slots:
+                    # Checked once a slot is free: every gathered category reaches this
+                    # point at once, and most then wait here behind the semaphore
+                    check_cancelled()
+                    cat_page, products, seen = await fetch_listing(cat_url, main_cat, sub_cat)
                 
                 # === NEW: Discover subcategories within this category page ===
                 # Look for links that look like subcategories (e.g., /chairs/executive-chairs/)
                 if main_cat == sub_cat:  # Only if no subcategory was detected from menu
                     try:
                         subcats_found = []
+                        cat_slug = cat_url.split('/')[-2]
                         # Look for product category links on this page
-                        subcat_selectors = [
-                            '.product-categories a',
-                            '.woocommerce-loop-category a',
-                            'ul.product-categories a',
-                            '.widget_product_categories a',
-                            '.category-list a',
-                            'aside a[href*="product-category"]',
-                            'a[href*="product-category"]'
-                        ]
-                        
-                        for sel in subcat_selectors:
+                        for sel in SUBCATEGORY_SELECTORS:
                             subcat_links = cat_page.css(sel)
                             if subcat_links and len(subcat_links) > 0:
                                 for sub_link in subcat_links:
@@ -608,13 +856,13 @@ def scrape_url(url):
                                         
                                         if not sub_href or not sub_text or len(sub_text) < 2:
                                             continue
-                                        if any(ex in sub_text.lower() for ex in EXCLUDE_KEYWORDS):
+                                        if EXCLUDE_RE.search(sub_text.lower()):
                                             continue
                                         
-                                        full_sub_url = urljoin(base_url, sub_href)
+                                        full_sub_url = join_url(base_url, sub_href)
                                         
                                         # Must be a child of current category URL
-                                        if full_sub_url.startswith(cat_url) or cat_url.split('/')[-2] in full_sub_url:
+                                        if full_sub_url.startswith(cat_url) or cat_slug in full_sub_url:
                                             if full_sub_url not in all_seen and full_sub_url != cat_url:
                                                 subcats_found.append({
                                                     "url": full_sub_url,
@@ -622,7 +870,7 @@ def scrape_url(url):
                                                     "mainCategory": main_cat,
                                                     "subCategory": sub_text
                                                 })
-                                    except:
+                                    except ValueError:  # malformed href
                                         continue
                                 break  # Found subcategories with this selector
                         
@@ -633,30 +881,48 @@ def scrape_url(url):
                     except Exception as e:
                         logger.warning(f"Subcategory discovery error: {e}")
                 
-                products, seen = extract_products_from_page(cat_page, base_url, brand_name, main_cat, sub_cat)
-                all_products.extend(products)
+                found.extend(products)
                 all_seen.update(seen)
                 logger.info(f"Found {len(products)} products in {sub_cat}")
                 
-                # Check for pagination in category
-                pagination = find_pagination(cat_page, base_url)
-                for pg_url in pagination[:5]:  # Limit pagination depth
-                    if pg_url not in all_seen:
-                        all_seen.add(pg_url)
-                        try:
-                            logger.info(f"Following pagination: {pg_url}")
-                            pg_page = fetcher.fetch(pg_url)
-                            products, seen = extract_products_from_page(pg_page, base_url, brand_name, main_cat, sub_cat)
-                            all_products.extend(products)
-                            all_seen.update(seen)
-                            logger.info(f"Found {len(products)} products on page")
-                        except Exception as e:
-                            logger.warning(f"Pagination error: {e}")
-                            continue
+                # Check for pagination in category; the pages are independent, so fetch them together
+                pagination = [u for u in find_pagination(cat_page, base_url)[:5] if u not in all_seen]  # Limit pagination depth
+                all_seen.update(pagination)
+                
+                async def fetch_pagination(pg_url):
+                    logger.info(f"Following pagination: {pg_url}")
+                    async with page_slots:
+                        check_cancelled()
+                        _, products, seen = await fetch_listing(pg_url, main_cat, sub_cat)
+                    return products, seen
+                
+                pages = await asyncio.gather(*(fetch_pagination(u) for u in pagination), return_exceptions=True)
+                for pg_result in pages:  # page order, same as a sequential walk
+                    if isinstance(pg_result, BaseException):
+                        if not isinstance(pg_result, ScrapeCancelled):
+                            logger.warning(f"Pagination error: {pg_result}")
+                            failed_pages += 1
+                        continue
+                    products, seen = pg_result
+                    found.extend(products)
+                    all_seen.update(seen)
+                    logger.info(f"Found {len(products)} products on page")
                             
+            except ScrapeCancelled:
+                raise
             except Exception as e:
                 logger.warning(f"Error crawling category {cat_url}: {e}")
+                failed_pages += 1
+            return found
+        
+        results = await asyncio.gather(*(crawl_category(cat) for cat in categories[:30]), return_exceptions=True)
+        check_cancelled()
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Category crawl failed: {result}")
+                failed_pages += 1
                 continue
+            all_products.extend(result)
         
         # === DEDUPLICATE ===
         # === DEDUPLICATE WITH CATEGORY PRIORITY ===
@@ -681,9 +947,8 @@ def scrape_url(url):
                 new_is_specific = p['mainCategory'] != p['subCategory']
                 
                 # 2. Prefer non-generic categories over "Homepage", "Products", "General"
-                generic_cats = ['homepage', 'products', 'general', 'select category']
-                existing_is_generic = existing['mainCategory'].lower() in generic_cats
-                new_is_generic = p['mainCategory'].lower() in generic_cats
+                existing_is_generic = existing['mainCategory'].lower() in GENERIC_CATEGORIES
+                new_is_generic = p['mainCategory'].lower() in GENERIC_CATEGORIES
                 
                 if new_is_specific and not existing_is_specific:
                     is_better = True
@@ -702,13 +967,21 @@ def scrape_url(url):
             "brandInfo": {
                 "name": brand_name,
                 "logo": logo
-            }
+            },
+            "failedPages": failed_pages
         }
         
         return result
         
+    except ScrapeCancelled:
+        logger.info(f"Extraction cancelled for {url}")
+        raise
     except Exception as e:
         logger.error(f"Extraction error: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        # Don't let a crashed browser fail every later crawl in this worker
+        await close_browser()
         raise e
+    finally:
+        await stack.aclose()
@@ -0,0 +1,97 @@
+"""
+In-memory task store for the scraper service.
+
+Tasks are spread over a fixed number of shards, each guarded by its own lock,
+so the task runner and polling clients only contend when they touch the same
+shard. Finished tasks expire a fixed time after reaching a terminal status,
+and each shard is capped in size with least-recently-used eviction so running
+tasks can't grow the store without bound either. An optional on_evict
+callback sees every state that leaves the store, e.g. to drop files it points to.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
+class TaskStore:
+    def __init__(self, shards=16, ttl=3600, max_per_shard=64, on_evict=None):
+        if shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        self._mask = shards - 1
+        # Each shard maps task_id -> [state, expires_at]; expires_at is None until terminal
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+        self.ttl = ttl
+        self.max_per_shard = max_per_shard
+        self.on_evict = on_evict
+
+    def _shard(self, task_id):
+        return self._shards[hash(task_id) & self._mask]
+
+    def _expires_at(self, state, now):
+        return now + self.ttl if state.get("status") in TERMINAL_STATUSES else None
+
+    def _sweep(self, entries, now):
+        """Drop expired and over-capacity entries; returns the removed (task_id, state) pairs."""
+        expired = [k for k, (_, exp) in entries.items() if exp is not None and exp <= now]
+        removed = [(task_id, entries.pop(task_id)[0]) for task_id in expired]
+        while len(entries) > self.max_per_shard:
+            task_id, (state, _) = entries.popitem(last=False)
+            removed.append((task_id, state))
+        return removed
+
+    def _evicted(self, removed):
+        # Called after the shard lock is released so the callback can do I/O
+        if self.on_evict is not None:
+            for task_id, state in removed:
+                self.on_evict(task_id, state)
+
+    def get(self, task_id):
+        """Return a copy of the task state, or None if unknown or expired."""
+        lock, entries = self._shard(task_id)
+        with lock:
+            entry = entries.get(task_id)
+            if entry is None:
+                return None
+            expired = entry[1] is not None and entry[1] <= time.monotonic()
+            if expired:
+                del entries[task_id]
+            else:
+                entries.move_to_end(task_id)
+                return dict(entry[0])
+        self._evicted([(task_id, entry[0])])
+        return None
+
+    def set(self, task_id, state):
+        """Replace the task state."""
+        lock, entries = self._shard(task_id)
+        now = time.monotonic()
+        with lock:
+            entries[task_id] = [dict(state), self._expires_at(state, now)]
+            entries.move_to_end(task_id)
+            removed = self._sweep(entries, now)
+        self._evicted(removed)
+
+    def update(self, task_id, fields):
+        """Merge fields into the task state, recreating it if it was evicted."""
+        lock, entries = self._shard(task_id)
+        now = time.monotonic()
+        with lock:
+            entry = entries.get(task_id)
+            state = entry[0] if entry is not None else {}
+            state.update(fields)
+            entries[task_id] = [state, self._expires_at(state, now)]
+            entries.move_to_end(task_id)
+            removed = self._sweep(entries, now)
+            state = dict(state)
+        self._evicted(removed)
+        return state
+
+    def delete(self, task_id):
+        lock, entries = self._shard(task_id)
+        with lock:
+            entry = entries.pop(task_id, None)
+        if entry is not None:
+            self._evicted([(task_id, entry[0])])
@@ -1,8 +1,25 @@
 import sys
 import json
-from urllib.parse import urljoin
+import re
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit
 try:
-    from scrapling import DynamicFetcher
+    from scrapling import DynamicFetcher, Fetcher
+    from lxml import etree, html as lxml_html  # installed with scrapling
+    
+    # Queries compiled once at import rather than on every call
+    # <title> lives in <head>; only search the whole document for malformed pages
+    _HEAD_TITLE_TEXT = etree.XPath('/html/head/title/text()')
+    _TITLE_TEXT = etree.XPath('//title/text()')
+    _HEADER_IMG_SRC = etree.XPath('(//header//img)[1]/@src')
+    # Product-card candidates: links to somewhere (not in-page anchors or
+    # javascript: handlers) that wrap an image
+    _IMAGE_LINKS = etree.XPath(
+        "//a[@href != ''][not(starts-with(@href, '#') or starts-with(@href, 'javascript'))][.//img]"
+    )
+    _FIRST_IMG = etree.XPath('(.//img)[1]')
+    # All text under the node, whitespace-collapsed and trimmed in one call
+    _DEEP_TEXT = etree.XPath('normalize-space(.)')
 except ImportError:
     pass
 import logging
@@ -12,66 +29,115 @@ import os
 logging.getLogger().setLevel(logging.CRITICAL)
 os.environ['SCRAPLING_LOG_LEVEL'] = 'CRITICAL' # Just in case
 
+# A plain HTTP fetch that already yields this many products is taken as-is
+MIN_STATIC_PRODUCTS = 3
+# Stop scanning a page once this many products are found, bounding work on huge listings
+MAX_PRODUCTS = 200
+# hrefs the concatenation fast path can't take: dot segments need urljoin's
+# normalization, urljoin strips tabs and newlines from anywhere in the URL, and
+# it rejects malformed IPv6 hosts (e.g. "http://[::1/x") with ValueError
+_NEEDS_URLJOIN_RE = re.compile(r'/\.|[\t\r\n\[\]]')
+
+def make_joiner(base_url):
+    """urljoin against a fixed base, with the common href shapes handled by
+    string concatenation and repeat hrefs (shared CDN images) cached"""
+    parts = urlsplit(base_url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    
+    @lru_cache(maxsize=16384)
+    def join(href):
+        if not _NEEDS_URLJOIN_RE.search(href):
+            if href.startswith(('http://', 'https://')):
+                return href
+            if href.startswith('//'):
+                return f"{parts.scheme}:{href}"
+            if href.startswith('/'):
+                return origin + href
+        return urljoin(base_url, href)
+    
+    return join
+
+def extract_products(tree, join):
+    """Image-link products from a parsed page; join resolves hrefs against the page URL"""
+    # Hashes of product URLs already emitted; 64-bit ints instead of the long
+    # CDN URL strings, and a collision within one page is vanishingly unlikely
+    seen_hashes = set()
+    
+    # Simple heuristic: Look for <a> tags that contain <img> and minimal text
+    # This matches many e-commerce grids. Let the parser do the filtering so
+    # image-less links (nav, footer, pagination) and anchor/javascript: links
+    # never reach the Python loop.
+    links = _IMAGE_LINKS(tree)
+    
+    # At most one product per link: size the list once and collect
+    # (name, link, image) tuples, building the output dicts at the end
+    found = [None] * min(len(links), MAX_PRODUCTS)
+    count = 0
+    
+    for link in links:
+        href = link.get('href')
+        
+        # Repeat cards (carousels, "related" strips) resolve to a product already
+        # taken; drop them before descending into the subtree
+        full_url = join(href)
+        url_hash = hash(full_url)
+        if url_hash in seen_hashes:
+            continue
+        
+        # Check for text (name): everything inside the link, including names wrapped
+        # in spans/headings, falling back to the image's alt text for image-only cards
+        img = _FIRST_IMG(link)[0]  # present: _IMAGE_LINKS only yields links containing an <img>
+        text = _DEEP_TEXT(link) or (img.get('alt') or '').strip()
+        if len(text) < 3 or len(text) > 200:
+            continue
+        
+        img_src = img.get('src') or img.get('data-src')
+        if img_src:
+            found[count] = (text, full_url, join(img_src))
+            count += 1
+            if count == MAX_PRODUCTS:
+                break
+            seen_hashes.add(url_hash)
+    del found[count:]
+    
+    # Frontend expects { name: "", link: "", image: "" } per product
+    return [{"name": name, "link": link_url, "image": image} for name, link_url, image in found]
+
 def scrape(url):
     try:
-        # Use DynamicFetcher as it proved working
-        fetcher = DynamicFetcher(headless=True)
-        page = fetcher.fetch(url)
+        join = make_joiner(url)
+        
+        # Server-rendered shops don't need a browser: try plain HTTP first and
+        # only render when the static HTML yields too few products
+        tree = None
+        products = []
+        try:
+            page = Fetcher.get(url, timeout=15)
+            if page.status == 200:
+                tree = lxml_html.fromstring(page.html_content)
+                products = extract_products(tree, join)
+        except Exception:
+            pass
+        
+        if len(products) < MIN_STATIC_PRODUCTS:
+            # Use DynamicFetcher as it proved working
+            fetcher = DynamicFetcher(headless=True)
+            # Products come from <img> attributes; skip downloading images, fonts and media
+            page = fetcher.fetch(url, disable_resources=True)
+            # The browser is only needed to render; traverse the result as plain lxml
+            # elements rather than wrapping every node in a Scrapling selector
+            tree = lxml_html.fromstring(page.html_content)
+            products = extract_products(tree, join)
         
         # Brand Info
-        title = page.css('title::text').get() or "Unknown Brand"
+        title = next(iter(_HEAD_TITLE_TEXT(tree) or _TITLE_TEXT(tree)), None) or "Unknown Brand"
         brand_name = title.split('|')[0].split('-')[0].strip()
         
         # Logo - try to find header logo
         logo = ""
-        logo_img = page.css('header img')
-        if logo_img:
-            src = logo_img.attrib.get('src')
-            if src:
-                logo = urljoin(url, src)
-        
-        products = []
-        seen_urls = set()
-        
-        # Simple heuristic: Look for <a> tags that contain <img> and minimal text
-        # This matches many e-commerce grids
-        links = page.css('a')
-        
-        for link in links:
-            href = link.attrib.get('href')
-            if not href or href.startswith('#') or href.startswith('javascript'):
-                continue
-                
-            full_url = urljoin(url, href)
-            
-            if full_url in seen_urls:
-                continue
-            
-            # Check for image inside
-            imgs = link.css('img')
-            
-            # Check for text (name)
-            # Text might be in a span or div inside, Scrapling's element .text gets all text
-            text = link.text
-            if not text:
-                continue
-            text = text.strip()
-            if len(text) < 3 or len(text) > 200:
-                continue
-                
-            if imgs:
-                img_src = imgs[0].attrib.get('src') or imgs[0].attrib.get('data-src')
-                if img_src:
-                    full_img_src = urljoin(url, img_src)
-                    
-                    products.append({
-                        "name": text,
-                        "link": full_url, # Frontend expects 'link' or 'url'? Scraper result usually has 'url' for product?
-                        # Existing brands have 'products' array. Let's check structure.
-                        # Usually: { name: "", link: "", image: "" }
-                        "image": full_img_src
-                    })
-                    seen_urls.add(full_url)
+        logo_src = _HEADER_IMG_SRC(tree)
+        if logo_src and logo_src[0]:
+            logo = join(logo_src[0])
         
         result = {
             "products": products,